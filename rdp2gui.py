@@ -30,39 +30,182 @@ gi.require_version('Gtk', '3.0')
 from gi.repository import Gtk, GLib, Gdk
 import subprocess
 import threading
+import concurrent.futures
+import collections
+import functools
 import os
 import shutil
+import shlex
 import json
 import tempfile
 import signal
-import re
+import time
 
-# Check if keyring module is available
+# Prefer orjson for reading and writing the config/credentials when installed
 try:
-    import keyring
-    # Try to detect and avoid KDE Wallet if it's causing issues
-    backend = keyring.get_keyring()
-    backend_name = backend.__class__.__name__.lower()
+    import orjson
     
-    # If KDE Wallet is detected and we're not on KDE, try to use Secret Service
-    if 'kde' in backend_name or 'kwallet' in backend_name:
-        try:
-            # Try to force SecretService backend for GNOME/XFCE
-            from keyring.backends import SecretService
-            keyring.set_keyring(SecretService.Keyring())
-            KEYRING_AVAILABLE = True
-        except:
-            # If we can't set SecretService, disable keyring to avoid KDE Wallet popups
-            KEYRING_AVAILABLE = False
-            print("KDE Wallet detected but not available. Using file storage instead.")
-    else:
-        KEYRING_AVAILABLE = True
+    def _dumps(obj, indent=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    
+    _loads = orjson.loads
 except ImportError:
-    KEYRING_AVAILABLE = False
-except Exception:
-    # Any other keyring initialization error - disable it
-    KEYRING_AVAILABLE = False
-    print("Keyring initialization failed. Using file storage instead.")
+    def _dumps(obj, indent=False):
+        return json.dumps(obj, indent=2 if indent else None).encode()
+    
+    _loads = json.loads
+
+# Number of recent connections to remember
+RECENT_MAX = 10
+
+# Number of saved passwords to keep; the least recently saved are dropped first
+CREDENTIALS_MAX = 200
+
+# Number of recent connection rows added per main loop iteration
+RECENT_BATCH_SIZE = 50
+
+# Pass the password on xfreerdp's stdin (/from-stdin:force) instead of /p: so it
+# stays out of the process list. Off until verified against FreeRDP 2.x and 3.x.
+_PASSWORD_VIA_STDIN = False
+
+# Number of xfreerdp output lines kept for error reporting
+RDP_OUTPUT_LINES = 100
+
+# Resolutions offered in the advanced options dialog
+RESOLUTIONS = ["1920x1080", "1680x1050", "1600x900", "1440x900",
+               "1366x768", "1280x1024", "1280x720", "1024x768"]
+
+# Stylesheet for the monitor identification windows
+IDENTIFY_CSS = b"""
+    window {
+        background-color: #2196F3;
+    }
+    label {
+        color: white;
+        font-size: 48px;
+        font-weight: bold;
+    }
+    label.info {
+        font-size: 18px;
+        font-weight: normal;
+    }
+"""
+
+# Columns of the recent connections list store
+RECENT_COL_HOSTNAME, RECENT_COL_USERNAME, RECENT_COL_DOMAIN, RECENT_COL_MARKUP = range(4)
+
+# On/off xfreerdp switches: (advanced option key, default, flag)
+_FLAG_MAP = (
+    # Performance flags - disabled for now to debug connection issues
+    # We'll re-enable these once basic connection works
+    #("disable_fonts", True, "+fonts"),
+    #("disable_wallpaper", True, "-wallpaper"),
+    #("disable_themes", True, "-themes"),
+    #("disable_aero", True, "+aero"),
+    #("disable_drag", False, "-window-drag"),
+    ("clipboard", True, "+clipboard"),
+    ("compression", True, "+compression"),
+)
+
+# Install scripts run in a terminal by the Install buttons
+_INSTALL_FREERDP_SH = """#!/bin/bash
+echo "Installing FreeRDP..."
+echo ""
+sudo apt update
+sudo apt install -y freerdp2-x11
+if [ $? -eq 0 ]; then
+    echo ""
+    echo "✓ FreeRDP installed successfully!"
+    echo ""
+    echo "Please restart the RDP GUI to use it."
+else
+    echo ""
+    echo "✗ Installation failed."
+    echo "Please check your internet connection and try again."
+fi
+echo ""
+echo "Press Enter to close..."
+read
+"""
+
+_INSTALL_KEYRING_SH = """#!/bin/bash
+echo "Installing Python keyring module..."
+echo ""
+sudo apt update
+sudo apt install -y python3-keyring python3-secretstorage gnome-keyring
+if [ $? -eq 0 ]; then
+    echo ""
+    echo "✓ Keyring support installed successfully!"
+    echo ""
+    echo "Please restart the RDP GUI to use secure password storage."
+else
+    echo ""
+    echo "✗ Installation failed."
+    echo "Please check your internet connection and try again."
+fi
+echo ""
+echo "Press Enter to close..."
+read
+"""
+
+def _escape(text):
+    """Escape text for use in Pango markup"""
+    return GLib.markup_escape_text(text, -1)
+
+@functools.lru_cache(maxsize=None)
+def _resolve_freerdp():
+    """Find the xfreerdp binary (scans PATH only once)"""
+    return shutil.which("xfreerdp3") or shutil.which("xfreerdp")
+
+def _write_install_script(script_path, contents):
+    """Write an install script unless an identical copy is already there"""
+    try:
+        with open(script_path, 'r') as f:
+            if f.read() == contents:
+                return
+    except OSError:
+        pass
+    with open(script_path, 'w') as f:
+        f.write(contents)
+
+# Keyring support is probed on first use (see _ensure_keyring) so a slow
+# DBus/Secret Service startup does not delay the main window
+keyring = None
+KEYRING_AVAILABLE = None  # None until probed, then True/False
+
+def _ensure_keyring():
+    """Import and configure the keyring module on first use"""
+    global keyring, KEYRING_AVAILABLE
+    if KEYRING_AVAILABLE is not None:
+        return KEYRING_AVAILABLE
+    
+    # Check if keyring module is available
+    try:
+        import keyring
+        # Try to detect and avoid KDE Wallet if it's causing issues
+        backend = keyring.get_keyring()
+        backend_name = backend.__class__.__name__.lower()
+        
+        # If KDE Wallet is detected and we're not on KDE, try to use Secret Service
+        if 'kde' in backend_name or 'kwallet' in backend_name:
+            try:
+                # Try to force SecretService backend for GNOME/XFCE
+                from keyring.backends import SecretService
+                keyring.set_keyring(SecretService.Keyring())
+                KEYRING_AVAILABLE = True
+            except:
+                # If we can't set SecretService, disable keyring to avoid KDE Wallet popups
+                KEYRING_AVAILABLE = False
+                print("KDE Wallet detected but not available. Using file storage instead.")
+        else:
+            KEYRING_AVAILABLE = True
+    except ImportError:
+        KEYRING_AVAILABLE = False
+    except Exception:
+        # Any other keyring initialization error - disable it
+        KEYRING_AVAILABLE = False
+        print("Keyring initialization failed. Using file storage instead.")
+    return KEYRING_AVAILABLE
 
 class RDPManager(Gtk.Window):
     def __init__(self):
@@ -154,16 +297,22 @@ class RDPManager(Gtk.Window):
         recent_frame = Gtk.Frame(label="Recent Connections")
         vbox.pack_start(recent_frame, True, True, 0)
         
-        # List box for recent connections
+        # Tree view for recent connections
         scrolled_window = Gtk.ScrolledWindow()
         scrolled_window.set_border_width(10)
         scrolled_window.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
         recent_frame.add(scrolled_window)
         
-        self.recent_listbox = Gtk.ListBox()
-        self.recent_listbox.set_selection_mode(Gtk.SelectionMode.SINGLE)
-        self.recent_listbox.connect("row-selected", self.on_recent_selected)
-        scrolled_window.add(self.recent_listbox)
+        self._recent_store = Gtk.ListStore(str, str, str, str)  # hostname, username, domain, markup
+        self.recent_treeview = Gtk.TreeView(model=self._recent_store)
+        self.recent_treeview.set_headers_visible(False)
+        recent_renderer = Gtk.CellRendererText()
+        recent_renderer.set_padding(5, 5)
+        self.recent_treeview.append_column(
+            Gtk.TreeViewColumn("Connection", recent_renderer, markup=RECENT_COL_MARKUP))
+        self.recent_treeview.get_selection().set_mode(Gtk.SelectionMode.SINGLE)
+        self.recent_treeview.get_selection().connect("changed", self.on_recent_selected)
+        scrolled_window.add(self.recent_treeview)
         
         # Add a toolbar for better visibility
         toolbar = Gtk.Toolbar()
@@ -202,8 +351,9 @@ class RDPManager(Gtk.Window):
             dialog.set_website_label("GitHub Project Page")
             dialog.set_authors(["RDP2GUI Contributors"])
             dialog.set_license_type(Gtk.License.MIT_X11)
-            dialog.run()
-            dialog.destroy()
+            dialog.set_modal(True)
+            dialog.connect("response", RDPManager._destroy_on_response)
+            dialog.show()
         
         help_button.connect("clicked", show_about)
         
@@ -242,8 +392,8 @@ class RDPManager(Gtk.Window):
         
         # Toggle keyring support
         self.keyring_toggle_item = Gtk.CheckMenuItem(label="Use System Keyring")
-        self.keyring_toggle_item.set_active(KEYRING_AVAILABLE)
-        self.keyring_toggle_item.connect("toggled", self.toggle_keyring_support)
+        self.keyring_toggle_item.set_active(True)  # Synced once keyring support is probed
+        self._keyring_toggle_handler = self.keyring_toggle_item.connect("toggled", self.toggle_keyring_support)
         tools_menu.append(self.keyring_toggle_item)
         
         # Separator
@@ -257,20 +407,46 @@ class RDPManager(Gtk.Window):
         
         # Initialize
         self.current_process = None
+        self._conn_watches = {}  # connection dialog -> process poll timeout
+        self._adv_dialog = None  # Built on first use, then reused
+        self._adv_widgets = {}
+        self._identify_css = None  # Shared CssProvider, created on first use
+        self._identify_windows = []
+        self._identify_open_count = 0
+        self._identify_timer = None  # Auto-close timeout for the identify windows
+        self._hostname_timeout = None
+        self._fields_before_lookup = None  # (username, domain) when the pending lookup started
+        
+        # Shared worker pool for short tasks (subprocess launches, config loading)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        self.connect("destroy", self.on_destroy)
         self.config_file = os.path.expanduser("~/.config/rdp2gui/config.json")
         self.credentials_file = os.path.expanduser("~/.config/rdp2gui/credentials.json")
-        self.use_keyring = KEYRING_AVAILABLE
+        os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+        self.use_keyring = True
+        self._terminal_cmd = None  # Argument template of the first terminal found
         self.debug_mode = False  # Set to True to see command output
         
-        # Load configuration
-        self.config = self.load_config()
-        self.stored_credentials = self.load_credentials()
-        
-        # Populate hostname dropdown
-        self.populate_hostname_dropdown()
-        
-        # Load recent connections
-        self.load_recent_connections()
+        # Load configuration in the background; widgets are filled once it arrives
+        self.config = {}
+        self._connections = self.config.setdefault("connections", {})
+        self._recent = collections.deque(maxlen=RECENT_MAX)  # Written back to config["recent"] on save
+        self._recent_set = set()  # Same hostnames as _recent, for membership tests
+        self._adv_cache = {}  # hostname -> advanced options
+        self._last_serialized = None  # Bytes of the last config write
+        self._config_dirty = False
+        self._config_loaded = False  # Nothing is written until the file has been read
+        self._save_timeout = None
+        self._recent_batch_source = None
+        self._recent_rows = {}  # hostname -> list store iter
+        self._recent_markup_prefix = {}  # hostname -> markup without the timestamp
+        self._executor.submit(self._bg_load_config)
+        self.stored_credentials = None  # (hostname, username) -> password, oldest first, loaded on first use
+        self._creds_dirty = False
+        self._creds_timeout = None
+        
+        # Probe keyring support once the main loop is running
+        GLib.idle_add(self._probe_keyring)
         
         # Check if xfreerdp is installed
         if not self.check_freerdp_installed():
@@ -278,15 +454,11 @@ class RDPManager(Gtk.Window):
     
     def check_freerdp_installed(self):
         """Check if xfreerdp is installed"""
-        return shutil.which("xfreerdp") is not None or shutil.which("xfreerdp3") is not None
+        return _resolve_freerdp() is not None
     
     def get_freerdp_command(self):
         """Get the correct freerdp command"""
-        if shutil.which("xfreerdp3"):
-            return "xfreerdp3"
-        elif shutil.which("xfreerdp"):
-            return "xfreerdp"
-        return None
+        return _resolve_freerdp()
     
     def populate_hostname_dropdown(self):
         """Populate the hostname dropdown with previously used computers"""
@@ -295,15 +467,14 @@ class RDPManager(Gtk.Window):
         
         # Start with recent connections (most recent first)
         hostnames = []
-        for hostname in self.config.get("recent", []):
+        for hostname in self._recent:
             if hostname not in hostnames:
                 hostnames.append(hostname)
         
         # Then add any other known hostnames
-        if "connections" in self.config:
-            for hostname in sorted(self.config["connections"].keys()):
-                if hostname not in hostnames:
-                    hostnames.append(hostname)
+        for hostname in sorted(self._connections.keys()):
+            if hostname not in hostnames:
+                hostnames.append(hostname)
         
         # Add hostnames to dropdown
         for hostname in hostnames:
@@ -313,17 +484,39 @@ class RDPManager(Gtk.Window):
     
     def on_hostname_changed(self, widget):
         """Handle hostname change to load saved settings"""
+        # Coalesce bursts of keystrokes into a single lookup
+        if self._hostname_timeout:
+            GLib.source_remove(self._hostname_timeout)
+        else:
+            # Remember the fields so anything typed before the lookup runs is kept
+            self._fields_before_lookup = (self.username_entry.get_text(),
+                                          self.domain_entry.get_text())
+        self._hostname_timeout = GLib.timeout_add(150, self._apply_hostname_change)
+    
+    def _apply_hostname_change(self):
+        """Load saved username and domain for the entered hostname"""
+        self._hostname_timeout = None
+        fields = (self.username_entry.get_text(), self.domain_entry.get_text())
+        if fields != self._fields_before_lookup:
+            return False  # The user has edited them since the hostname changed
+        
         hostname = self.hostname_entry.get_text().strip()
-        if hostname in self.config.get("connections", {}):
-            conn_data = self.config["connections"][hostname]
+        conn_data = self._connections.get(hostname)
+        if conn_data:
             # Load saved username and domain
             if "username" in conn_data:
                 self.username_entry.set_text(conn_data["username"])
             if "domain" in conn_data:
                 self.domain_entry.set_text(conn_data["domain"])
+        return False
     
     def on_connect_clicked(self, widget):
         """Handle connect button click"""
+        # Apply any pending hostname lookup before reading the fields
+        if self._hostname_timeout:
+            GLib.source_remove(self._hostname_timeout)
+            self._apply_hostname_change()
+        
         hostname = self.hostname_entry.get_text().strip()
         username = self.username_entry.get_text().strip()
         domain = self.domain_entry.get_text().strip()
@@ -362,7 +555,7 @@ class RDPManager(Gtk.Window):
         content_area.add(vbox)
         
         # Info label
-        info_text = f"<b>Enter password for {username}@{hostname}</b>"
+        info_text = f"<b>Enter password for {_escape(username)}@{_escape(hostname)}</b>"
         info_label = Gtk.Label()
         info_label.set_markup(info_text)
         vbox.pack_start(info_label, False, False, 0)
@@ -391,7 +584,7 @@ class RDPManager(Gtk.Window):
         vbox.pack_start(remember_check, False, False, 0)
         
         # Security note
-        if KEYRING_AVAILABLE and self.use_keyring:
+        if self.use_keyring and _ensure_keyring():
             security_text = "Password will be stored in your system keyring"
         else:
             security_text = "Password will be stored locally (encrypted)"
@@ -433,27 +626,19 @@ class RDPManager(Gtk.Window):
             self.show_error("FreeRDP is not installed")
             return
         
-        # Build command
-        cmd = [freerdp_cmd]
-        
-        # Add hostname
-        cmd.append(f"/v:{hostname}")
-        
-        # Add username and domain
+        # Build command with hostname, username and domain
+        cmd = [freerdp_cmd, f"/v:{hostname}", f"/u:{username}"]
         if domain:
-            cmd.append(f"/u:{username}")
             cmd.append(f"/d:{domain}")
-        else:
-            cmd.append(f"/u:{username}")
         
-        # Password handling - check if we can use more secure methods
-        # Try to use environment variable or stdin to avoid password in process list
-        use_env_password = False
-        
-        # Check xfreerdp version and capabilities
-        # For now, we'll use direct password but this can be improved
-        # TODO: Implement /from-stdin or environment variable method
-        cmd.append(f"/p:{password}")
+        if _PASSWORD_VIA_STDIN:
+            # Username and domain are on the command line, so with /from-stdin:force
+            # xfreerdp only reads the password line
+            cmd.append("/from-stdin:force")
+            stdin_data = password + "\n"
+        else:
+            cmd.append(f"/p:{password}")
+            stdin_data = ""
         
         # Get advanced options for this host
         advanced_opts = self.get_advanced_options(hostname)
@@ -464,7 +649,7 @@ class RDPManager(Gtk.Window):
         else:
             # Use specified resolution if not fullscreen
             resolution = advanced_opts.get("resolution", "1920x1080")
-            cmd.extend([f"/size:{resolution}"])
+            cmd.append(f"/size:{resolution}")
         
         # Multi-monitor support
         if advanced_opts.get("multimon", False):
@@ -473,21 +658,8 @@ class RDPManager(Gtk.Window):
             # Specific monitors if selected
             selected_monitors = advanced_opts.get("selected_monitors", [])
             if selected_monitors:
-                monitors_str = ",".join(str(m) for m in selected_monitors)
-                cmd.extend([f"/monitors:{monitors_str}"])
-        
-        # Performance flags - commented out for now to debug connection issues
-        # We'll re-enable these once basic connection works
-        #if advanced_opts.get("disable_fonts", True):
-        #    cmd.append("+fonts")
-        #if advanced_opts.get("disable_wallpaper", True):
-        #    cmd.append("-wallpaper")
-        #if advanced_opts.get("disable_themes", True):
-        #    cmd.append("-themes")
-        #if advanced_opts.get("disable_aero", True):
-        #    cmd.append("+aero")
-        #if advanced_opts.get("disable_drag", False):
-        #    cmd.append("-window-drag")
+                monitors_str = ",".join([str(m) for m in selected_monitors])
+                cmd.append(f"/monitors:{monitors_str}")
         
         # Audio - simplified for compatibility
         audio_mode = advanced_opts.get("audio_mode", "local")
@@ -498,14 +670,10 @@ class RDPManager(Gtk.Window):
         elif audio_mode == "disabled":
             cmd.append("/audio-mode:2")
         
-        # Clipboard
-        if advanced_opts.get("clipboard", True):
-            cmd.append("+clipboard")
-        
         # Drive redirection
         if advanced_opts.get("redirect_drives", False):
             home_dir = os.path.expanduser("~")
-            cmd.extend([f"/drive:home,{home_dir}"])
+            cmd.append(f"/drive:home,{home_dir}")
         
         # Certificate acceptance
         cmd.append("/cert:ignore")
@@ -516,42 +684,55 @@ class RDPManager(Gtk.Window):
         else:
             cmd.append("/sec:rdp")
         
-        # Compression
-        if advanced_opts.get("compression", True):
-            cmd.append("+compression")
+        # Simple on/off switches (clipboard, compression, ...)
+        cmd.extend([flag for key, default, flag in _FLAG_MAP if advanced_opts.get(key, default)])
         
         # Debug: Print command for troubleshooting (hide password for security)
         if self.debug_mode:
-            debug_cmd = []
-            for arg in cmd:
-                if arg.startswith("/p:"):
-                    debug_cmd.append("/p:********")  # Hide password
-                else:
-                    debug_cmd.append(arg)
+            debug_cmd = ["/p:********" if arg.startswith("/p:") else arg for arg in cmd]
             print(f"Running command: {' '.join(debug_cmd)}")
         
-        # Start the RDP session
+        # Start the RDP session on a worker thread so the UI stays responsive
+        self._executor.submit(self._launch_rdp_process, cmd, stdin_data, hostname, username)
+    
+    def _launch_rdp_process(self, cmd, stdin_data, hostname, username):
+        """Start xfreerdp and report the result back to the main loop (runs in a worker thread)"""
         try:
             # Run xfreerdp in a new process
             # Use subprocess properly to avoid shell interpretation
-            self.current_process = subprocess.Popen(
+            process = subprocess.Popen(
                 cmd,
+                stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
+                stderr=subprocess.STDOUT,
+                close_fds=True,  # Don't leak X/DBus/keyring descriptors
+                start_new_session=True,  # Keep terminal signals away from xfreerdp
                 shell=False  # Important: don't use shell to avoid interpretation
             )
             
+            # Keep draining the output for the whole session so xfreerdp never
+            # blocks on a full pipe; only the last lines are kept in memory
+            output = collections.deque(maxlen=RDP_OUTPUT_LINES)
+            drain = threading.Thread(target=self._drain_output,
+                                     args=(process.stdout, output), daemon=True)
+            drain.start()
+            
+            # Hand over the password (when sent on stdin) and close stdin
+            try:
+                process.stdin.write(stdin_data.encode())
+                process.stdin.close()
+            except BrokenPipeError:
+                pass  # Process already exited; reported below
+            
             # Check if process started successfully
             # Give it a moment to see if it fails immediately
-            import time
             time.sleep(1)  # Increased wait time
-            poll_result = self.current_process.poll()
+            poll_result = process.poll()
             
             if poll_result is not None:
                 # Process ended already - there was an error
-                stdout, stderr = self.current_process.communicate()
-                error_msg = stderr if stderr else stdout
+                drain.join(1)  # Let the reader pick up the last of the output
+                error_msg = b"".join(output).decode(errors="replace")
                 if not error_msg:
                     error_msg = f"Process exited with code {poll_result}"
                 
@@ -563,17 +744,29 @@ class RDPManager(Gtk.Window):
                 elif "could not connect" in error_msg.lower() or "unable to connect" in error_msg.lower():
                     error_msg = f"Could not connect to {hostname}. Please check the hostname and network connection.\n\n" + error_msg
                 
-                self.show_error(f"RDP Connection Failed:\n\n{error_msg[:500]}")
-                self.current_process = None
+                GLib.idle_add(self.show_error, f"RDP Connection Failed:\n\n{error_msg[:500]}")
                 return
             
             # Show connection window
-            self.show_connection_window(hostname, username)
+            GLib.idle_add(self._on_rdp_started, process, hostname, username)
             
         except Exception as e:
-            self.show_error(f"Failed to start RDP connection: {str(e)}")
+            GLib.idle_add(self.show_error, f"Failed to start RDP connection: {str(e)}")
+    
+    @staticmethod
+    def _drain_output(stream, output):
+        """Read process output until EOF, keeping only the most recent lines"""
+        with stream:
+            for line in iter(lambda: stream.readline(4096), b""):
+                output.append(line)
     
-    def show_connection_window(self, hostname, username):
+    def _on_rdp_started(self, process, hostname, username):
+        """Track the started process and show the connection window"""
+        self.current_process = process
+        self.show_connection_window(hostname, username, process)
+        return False
+    
+    def show_connection_window(self, hostname, username, process):
         """Show a window indicating active connection"""
         dialog = Gtk.Dialog(
             title=f"Connected to {hostname}",
@@ -593,7 +786,7 @@ class RDPManager(Gtk.Window):
         
         # Status label
         status_label = Gtk.Label()
-        status_label.set_markup(f"<b>Connected to {hostname}</b>\nUser: {username}")
+        status_label.set_markup(f"<b>Connected to {_escape(hostname)}</b>\nUser: {_escape(username)}")
         vbox.pack_start(status_label, True, True, 0)
         
         # Info label
@@ -601,30 +794,62 @@ class RDPManager(Gtk.Window):
         info_label.set_markup("<small>Close this window to disconnect</small>")
         vbox.pack_start(info_label, False, False, 0)
         
+        dialog.connect("response", self._on_connection_response, process)
         dialog.show_all()
         
-        # Monitor the process in a background thread
-        def monitor_process():
-            if self.current_process:
-                self.current_process.wait()
-                GLib.idle_add(dialog.destroy)
-        
-        thread = threading.Thread(target=monitor_process)
-        thread.daemon = True
-        thread.start()
-        
-        response = dialog.run()
+        # Poll the process from the main loop; a session can last for hours,
+        # so waiting on it must not tie up one of the pool's workers
+        self._conn_watches[dialog] = GLib.timeout_add_seconds(1, self._poll_connection, process, dialog)
+    
+    def _on_connection_response(self, dialog, response, process):
+        """Disconnect when the connection dialog is closed"""
+        watch = self._conn_watches.pop(dialog, None)
+        if watch:
+            GLib.source_remove(watch)
+        dialog.destroy()
         
         # Kill the process if dialog is closed
-        if self.current_process:
-            try:
-                self.current_process.terminate()
-                self.current_process.wait(timeout=5)
-            except:
-                self.current_process.kill()
+        if process.poll() is None:
+            process.terminate()
+            # Escalate if xfreerdp has not exited after 5 seconds
+            GLib.timeout_add_seconds(5, self._kill_if_running, process)
+        if self.current_process is process:
             self.current_process = None
+    
+    def _kill_if_running(self, process):
+        """Kill a process that ignored the terminate request"""
+        if process.poll() is None:
+            process.kill()
+        return False
+    
+    def _poll_connection(self, process, dialog):
+        """Close the connection dialog once the session ends on its own"""
+        if process.poll() is None:
+            return True  # Still running, check again later
         
+        self._conn_watches.pop(dialog, None)
         dialog.destroy()
+        if self.current_process is process:
+            self.current_process = None
+        return False
+    
+    def on_destroy(self, widget):
+        """Flush pending changes and stop background workers when the main window is closed"""
+        # Each step runs even if an earlier one fails (e.g. disk full)
+        try:
+            if not self._config_loaded:
+                # Don't let an unfinished background load drop changes made meanwhile
+                self._merge_loaded_config(self.load_config())
+            if self._save_timeout:
+                GLib.source_remove(self._save_timeout)
+            self._flush_config()
+        finally:
+            try:
+                if self._creds_timeout:
+                    GLib.source_remove(self._creds_timeout)
+                self._flush_credentials()
+            finally:
+                self._executor.shutdown(wait=False)
     
     def show_advanced_options(self, widget):
         """Show advanced options dialog"""
@@ -633,8 +858,85 @@ class RDPManager(Gtk.Window):
             self.show_error("Please enter a hostname first")
             return
         
+        # The dialog is built once and reused; only its values change per host
+        if self._adv_dialog is None:
+            self._adv_dialog = self._build_advanced_dialog()
+        dialog = self._adv_dialog
+        w = self._adv_widgets
+        dialog.set_title(f"Advanced Options - {hostname}")
+        
+        # Get current settings
+        advanced_opts = self.get_advanced_options(hostname)
+        
+        w["fullscreen"].set_active(advanced_opts.get("fullscreen", True))
+        
+        current_res = advanced_opts.get("resolution", "1920x1080")
+        if current_res in RESOLUTIONS:
+            w["resolution"].set_active(RESOLUTIONS.index(current_res))
+        else:
+            w["resolution"].set_active(0)
+        
+        w["multimon"].set_active(advanced_opts.get("multimon", False))
+        selected_monitors = advanced_opts.get("selected_monitors", [])
+        w["monitors"].set_text(",".join([str(m) for m in selected_monitors]))
+        
+        w["disable_fonts"].set_active(advanced_opts.get("disable_fonts", True))
+        w["disable_wallpaper"].set_active(advanced_opts.get("disable_wallpaper", True))
+        w["disable_themes"].set_active(advanced_opts.get("disable_themes", True))
+        w["disable_aero"].set_active(advanced_opts.get("disable_aero", True))
+        w["disable_drag"].set_active(advanced_opts.get("disable_drag", True))
+        w["compression"].set_active(advanced_opts.get("compression", True))
+        
+        audio_radio = w.get("audio_" + advanced_opts.get("audio_mode", "local"), w["audio_local"])
+        audio_radio.set_active(True)
+        
+        w["clipboard"].set_active(advanced_opts.get("clipboard", True))
+        w["redirect_drives"].set_active(advanced_opts.get("redirect_drives", False))
+        w["nla"].set_active(advanced_opts.get("nla", True))
+        
+        dialog.show_all()
+        
+        response = dialog.run()
+        
+        # Hide rather than destroy so the next open is instant
+        dialog.hide()
+        
+        if response == Gtk.ResponseType.OK:
+            # Save settings
+            new_opts = {
+                "fullscreen": w["fullscreen"].get_active(),
+                "resolution": w["resolution"].get_active_text(),
+                "multimon": w["multimon"].get_active(),
+                "selected_monitors": [],
+                "disable_fonts": w["disable_fonts"].get_active(),
+                "disable_wallpaper": w["disable_wallpaper"].get_active(),
+                "disable_themes": w["disable_themes"].get_active(),
+                "disable_aero": w["disable_aero"].get_active(),
+                "disable_drag": w["disable_drag"].get_active(),
+                "compression": w["compression"].get_active(),
+                "audio_mode": "local" if w["audio_local"].get_active() else 
+                             "remote" if w["audio_remote"].get_active() else "disabled",
+                "clipboard": w["clipboard"].get_active(),
+                "redirect_drives": w["redirect_drives"].get_active(),
+                "nla": w["nla"].get_active()
+            }
+            
+            # Parse monitor selection
+            monitor_text = w["monitors"].get_text().strip()
+            for part in monitor_text.split(","):
+                part = part.strip()
+                if part.isdecimal():
+                    new_opts["selected_monitors"].append(int(part))
+            
+            self.save_advanced_options(hostname, new_opts)
+            self.show_info("Advanced options saved")
+    
+    def _build_advanced_dialog(self):
+        """Build the advanced options dialog and remember its input widgets"""
+        w = self._adv_widgets = {}
+        
         dialog = Gtk.Dialog(
-            title=f"Advanced Options - {hostname}",
+            title="Advanced Options",
             parent=self,
             flags=0
         )
@@ -656,9 +958,6 @@ class RDPManager(Gtk.Window):
         vbox.set_border_width(10)
         scrolled.add_with_viewport(vbox)
         
-        # Get current settings
-        advanced_opts = self.get_advanced_options(hostname)
-        
         # Display settings frame
         display_frame = Gtk.Frame(label="Display Settings")
         vbox.pack_start(display_frame, False, False, 0)
@@ -668,9 +967,8 @@ class RDPManager(Gtk.Window):
         display_frame.add(display_box)
         
         # Fullscreen checkbox
-        fullscreen_check = Gtk.CheckButton(label="Fullscreen mode")
-        fullscreen_check.set_active(advanced_opts.get("fullscreen", True))
-        display_box.pack_start(fullscreen_check, False, False, 0)
+        w["fullscreen"] = Gtk.CheckButton(label="Fullscreen mode")
+        display_box.pack_start(w["fullscreen"], False, False, 0)
         
         # Resolution (when not fullscreen)
         resolution_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
@@ -681,24 +979,14 @@ class RDPManager(Gtk.Window):
         resolution_label.set_xalign(0)
         resolution_box.pack_start(resolution_label, False, False, 0)
         
-        resolution_combo = Gtk.ComboBoxText()
-        resolutions = ["1920x1080", "1680x1050", "1600x900", "1440x900", 
-                       "1366x768", "1280x1024", "1280x720", "1024x768"]
-        for res in resolutions:
-            resolution_combo.append_text(res)
-        
-        current_res = advanced_opts.get("resolution", "1920x1080")
-        if current_res in resolutions:
-            resolution_combo.set_active(resolutions.index(current_res))
-        else:
-            resolution_combo.set_active(0)
-        
-        resolution_box.pack_start(resolution_combo, True, True, 0)
+        w["resolution"] = Gtk.ComboBoxText()
+        for res in RESOLUTIONS:
+            w["resolution"].append_text(res)
+        resolution_box.pack_start(w["resolution"], True, True, 0)
         
         # Multi-monitor settings
-        multimon_check = Gtk.CheckButton(label="Use multiple monitors")
-        multimon_check.set_active(advanced_opts.get("multimon", False))
-        display_box.pack_start(multimon_check, False, False, 0)
+        w["multimon"] = Gtk.CheckButton(label="Use multiple monitors")
+        display_box.pack_start(w["multimon"], False, False, 0)
         
         # Monitor selection
         monitor_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
@@ -709,12 +997,9 @@ class RDPManager(Gtk.Window):
         monitor_label.set_xalign(0)
         monitor_box.pack_start(monitor_label, False, False, 0)
         
-        monitor_entry = Gtk.Entry()
-        monitor_entry.set_placeholder_text("e.g., 0,1 (leave empty for all)")
-        selected_monitors = advanced_opts.get("selected_monitors", [])
-        if selected_monitors:
-            monitor_entry.set_text(",".join(str(m) for m in selected_monitors))
-        monitor_box.pack_start(monitor_entry, True, True, 0)
+        w["monitors"] = Gtk.Entry()
+        w["monitors"].set_placeholder_text("e.g., 0,1 (leave empty for all)")
+        monitor_box.pack_start(w["monitors"], True, True, 0)
         
         identify_btn = Gtk.Button(label="Identify")
         identify_btn.connect("clicked", self.identify_monitors)
@@ -729,29 +1014,23 @@ class RDPManager(Gtk.Window):
         perf_frame.add(perf_box)
         
         # Performance checkboxes
-        disable_fonts_check = Gtk.CheckButton(label="Disable font smoothing")
-        disable_fonts_check.set_active(advanced_opts.get("disable_fonts", True))
-        perf_box.pack_start(disable_fonts_check, False, False, 0)
+        w["disable_fonts"] = Gtk.CheckButton(label="Disable font smoothing")
+        perf_box.pack_start(w["disable_fonts"], False, False, 0)
         
-        disable_wallpaper_check = Gtk.CheckButton(label="Disable wallpaper")
-        disable_wallpaper_check.set_active(advanced_opts.get("disable_wallpaper", True))
-        perf_box.pack_start(disable_wallpaper_check, False, False, 0)
+        w["disable_wallpaper"] = Gtk.CheckButton(label="Disable wallpaper")
+        perf_box.pack_start(w["disable_wallpaper"], False, False, 0)
         
-        disable_themes_check = Gtk.CheckButton(label="Disable themes")
-        disable_themes_check.set_active(advanced_opts.get("disable_themes", True))
-        perf_box.pack_start(disable_themes_check, False, False, 0)
+        w["disable_themes"] = Gtk.CheckButton(label="Disable themes")
+        perf_box.pack_start(w["disable_themes"], False, False, 0)
         
-        disable_aero_check = Gtk.CheckButton(label="Disable desktop composition")
-        disable_aero_check.set_active(advanced_opts.get("disable_aero", True))
-        perf_box.pack_start(disable_aero_check, False, False, 0)
+        w["disable_aero"] = Gtk.CheckButton(label="Disable desktop composition")
+        perf_box.pack_start(w["disable_aero"], False, False, 0)
         
-        disable_drag_check = Gtk.CheckButton(label="Disable full window drag")
-        disable_drag_check.set_active(advanced_opts.get("disable_drag", True))
-        perf_box.pack_start(disable_drag_check, False, False, 0)
+        w["disable_drag"] = Gtk.CheckButton(label="Disable full window drag")
+        perf_box.pack_start(w["disable_drag"], False, False, 0)
         
-        compression_check = Gtk.CheckButton(label="Enable compression")
-        compression_check.set_active(advanced_opts.get("compression", True))
-        perf_box.pack_start(compression_check, False, False, 0)
+        w["compression"] = Gtk.CheckButton(label="Enable compression")
+        perf_box.pack_start(w["compression"], False, False, 0)
         
         # Audio frame
         audio_frame = Gtk.Frame(label="Audio Settings")
@@ -762,17 +1041,14 @@ class RDPManager(Gtk.Window):
         audio_frame.add(audio_box)
         
         # Audio mode radio buttons
-        audio_local_radio = Gtk.RadioButton.new_with_label_from_widget(None, "Play on this computer")
-        audio_local_radio.set_active(advanced_opts.get("audio_mode", "local") == "local")
-        audio_box.pack_start(audio_local_radio, False, False, 0)
+        w["audio_local"] = Gtk.RadioButton.new_with_label_from_widget(None, "Play on this computer")
+        audio_box.pack_start(w["audio_local"], False, False, 0)
         
-        audio_remote_radio = Gtk.RadioButton.new_with_label_from_widget(audio_local_radio, "Play on remote computer")
-        audio_remote_radio.set_active(advanced_opts.get("audio_mode", "local") == "remote")
-        audio_box.pack_start(audio_remote_radio, False, False, 0)
+        w["audio_remote"] = Gtk.RadioButton.new_with_label_from_widget(w["audio_local"], "Play on remote computer")
+        audio_box.pack_start(w["audio_remote"], False, False, 0)
         
-        audio_disabled_radio = Gtk.RadioButton.new_with_label_from_widget(audio_local_radio, "Do not play")
-        audio_disabled_radio.set_active(advanced_opts.get("audio_mode", "local") == "disabled")
-        audio_box.pack_start(audio_disabled_radio, False, False, 0)
+        w["audio_disabled"] = Gtk.RadioButton.new_with_label_from_widget(w["audio_local"], "Do not play")
+        audio_box.pack_start(w["audio_disabled"], False, False, 0)
         
         # Local resources frame
         resources_frame = Gtk.Frame(label="Local Resources")
@@ -782,13 +1058,11 @@ class RDPManager(Gtk.Window):
         resources_box.set_border_width(10)
         resources_frame.add(resources_box)
         
-        clipboard_check = Gtk.CheckButton(label="Clipboard")
-        clipboard_check.set_active(advanced_opts.get("clipboard", True))
-        resources_box.pack_start(clipboard_check, False, False, 0)
+        w["clipboard"] = Gtk.CheckButton(label="Clipboard")
+        resources_box.pack_start(w["clipboard"], False, False, 0)
         
-        drives_check = Gtk.CheckButton(label="Share home directory")
-        drives_check.set_active(advanced_opts.get("redirect_drives", False))
-        resources_box.pack_start(drives_check, False, False, 0)
+        w["redirect_drives"] = Gtk.CheckButton(label="Share home directory")
+        resources_box.pack_start(w["redirect_drives"], False, False, 0)
         
         # Security frame
         security_frame = Gtk.Frame(label="Security Settings")
@@ -798,95 +1072,67 @@ class RDPManager(Gtk.Window):
         security_box.set_border_width(10)
         security_frame.add(security_box)
         
-        nla_check = Gtk.CheckButton(label="Network Level Authentication (NLA)")
-        nla_check.set_active(advanced_opts.get("nla", True))
-        security_box.pack_start(nla_check, False, False, 0)
-        
-        dialog.show_all()
-        
-        response = dialog.run()
-        
-        if response == Gtk.ResponseType.OK:
-            # Save settings
-            new_opts = {
-                "fullscreen": fullscreen_check.get_active(),
-                "resolution": resolution_combo.get_active_text(),
-                "multimon": multimon_check.get_active(),
-                "selected_monitors": [],
-                "disable_fonts": disable_fonts_check.get_active(),
-                "disable_wallpaper": disable_wallpaper_check.get_active(),
-                "disable_themes": disable_themes_check.get_active(),
-                "disable_aero": disable_aero_check.get_active(),
-                "disable_drag": disable_drag_check.get_active(),
-                "compression": compression_check.get_active(),
-                "audio_mode": "local" if audio_local_radio.get_active() else 
-                             "remote" if audio_remote_radio.get_active() else "disabled",
-                "clipboard": clipboard_check.get_active(),
-                "redirect_drives": drives_check.get_active(),
-                "nla": nla_check.get_active()
-            }
-            
-            # Parse monitor selection
-            monitor_text = monitor_entry.get_text().strip()
-            if monitor_text:
-                try:
-                    new_opts["selected_monitors"] = [int(m.strip()) for m in monitor_text.split(",")]
-                except:
-                    pass
-            
-            self.save_advanced_options(hostname, new_opts)
-            self.show_info("Advanced options saved")
+        w["nla"] = Gtk.CheckButton(label="Network Level Authentication (NLA)")
+        security_box.pack_start(w["nla"], False, False, 0)
         
-        dialog.destroy()
+        return dialog
     
     def identify_monitors(self, widget=None):
         """Show monitor identification windows"""
+        # GDK already knows the monitor layout
+        display = Gdk.Display.get_default()
+        if display is None:
+            self.show_error("Could not get monitor information")
+            return
+        
+        monitors = []
+        for i in range(display.get_n_monitors()):
+            monitor = display.get_monitor(i)
+            geometry = monitor.get_geometry()
+            monitors.append({
+                'index': i,
+                'name': monitor.get_model() or f"Monitor {i}",
+                'width': geometry.width,
+                'height': geometry.height,
+                'x': geometry.x,
+                'y': geometry.y
+            })
+        self._build_identify_windows(monitors)
+    
+    @staticmethod
+    def _destroy_on_response(dialog, response):
+        """Close a dialog that only needs acknowledging"""
+        dialog.destroy()
+    
+    @staticmethod
+    def _id_click(window, event):
+        """Close an identification window when it is clicked"""
+        window.destroy()
+    
+    @staticmethod
+    def _id_key(window, event):
+        """Close an identification window when ESC is pressed"""
+        if event.keyval == Gdk.KEY_Escape:
+            window.destroy()
+    
+    def _build_identify_windows(self, monitors):
+        """Show a numbered window on each monitor"""
         try:
-            # Get monitor information using xrandr
-            result = subprocess.run(
-                ["xrandr", "--query"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode != 0:
-                self.show_error("Could not get monitor information")
-                return
-            
-            # Parse xrandr output
-            monitors = []
-            monitor_index = 0
-            
-            for line in result.stdout.split('\n'):
-                if ' connected' in line and not 'disconnected' in line:
-                    # Extract monitor info
-                    parts = line.split()
-                    name = parts[0]
-                    
-                    # Find resolution and position
-                    for part in parts:
-                        match = re.match(r'(\d+)x(\d+)\+(\d+)\+(\d+)', part)
-                        if match:
-                            width = int(match.group(1))
-                            height = int(match.group(2))
-                            x = int(match.group(3))
-                            y = int(match.group(4))
-                            monitors.append({
-                                'index': monitor_index,
-                                'name': name,
-                                'width': width,
-                                'height': height,
-                                'x': x,
-                                'y': y
-                            })
-                            monitor_index += 1
-                            break
-            
             if not monitors:
                 self.show_info("No monitors detected")
                 return
             
+            # Close windows left over from a previous identify
+            if self._identify_timer:
+                GLib.source_remove(self._identify_timer)
+                self._close_identify_windows()
+            
+            # One stylesheet shared by all identification windows; it is added per
+            # window rather than per screen so it doesn't restyle the main window
+            if self._identify_css is None:
+                self._identify_css = Gtk.CssProvider()
+                self._identify_css.load_from_data(IDENTIFY_CSS)
+            
             # Create identification windows
             id_windows = []
             
@@ -907,24 +1153,8 @@ class RDPManager(Gtk.Window):
                 window.add(vbox)
                 
                 # Add background color
-                css_provider = Gtk.CssProvider()
-                css_provider.load_from_data(b"""
-                    window {
-                        background-color: #2196F3;
-                    }
-                    label {
-                        color: white;
-                        font-size: 48px;
-                        font-weight: bold;
-                    }
-                    label.info {
-                        font-size: 18px;
-                        font-weight: normal;
-                    }
-                """)
-                
-                style_context = window.get_style_context()
-                style_context.add_provider(css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+                window.get_style_context().add_provider(
+                    self._identify_css, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
                 
                 # Monitor number
                 number_label = Gtk.Label(label=str(mon['index']))
@@ -942,154 +1172,294 @@ class RDPManager(Gtk.Window):
                 vbox.pack_start(close_label, False, False, 0)
                 
                 # Connect events
-                window.connect("button-press-event", lambda w, e: w.destroy())
-                window.connect("key-press-event", lambda w, e: w.destroy() if e.keyval == Gdk.KEY_Escape else None)
+                window.connect("button-press-event", RDPManager._id_click)
+                window.connect("key-press-event", RDPManager._id_key)
+                window.connect("destroy", self._on_identify_window_destroyed)
                 
-                window.show_all()
                 id_windows.append(window)
             
-            # Auto-close after 5 seconds
-            def close_all():
-                for w in id_windows:
-                    if w.get_visible():
-                        w.destroy()
-                return False
+            # Map all windows in one pass once they are fully built
+            for window in id_windows:
+                window.show_all()
             
-            GLib.timeout_add_seconds(5, close_all)
+            # Auto-close after 5 seconds
+            self._identify_windows = id_windows
+            self._identify_open_count = len(id_windows)
+            self._identify_timer = GLib.timeout_add_seconds(5, self._close_identify_windows)
             
         except Exception as e:
             self.show_error(f"Error identifying monitors: {str(e)}")
     
+    def _on_identify_window_destroyed(self, window):
+        """Cancel the auto-close timer once every identification window is gone"""
+        self._identify_open_count -= 1
+        if self._identify_open_count <= 0:
+            self._identify_windows = []
+            if self._identify_timer:
+                GLib.source_remove(self._identify_timer)
+                self._identify_timer = None
+    
+    def _close_identify_windows(self):
+        """Close any identification windows that are still open"""
+        self._identify_timer = None
+        for w in self._identify_windows:
+            if w.get_visible():
+                w.destroy()
+        self._identify_windows = []
+        return False
+    
     def get_advanced_options(self, hostname):
         """Get advanced options for a specific host"""
-        if hostname in self.config.get("connections", {}):
-            return self.config["connections"][hostname].get("advanced", {})
-        return {}
+        if hostname in self._adv_cache:
+            return self._adv_cache[hostname]
+        
+        options = {}
+        conn = self._connections.get(hostname)
+        if conn:
+            options = conn.get("advanced", {})
+        self._adv_cache[hostname] = options
+        return options
     
     def save_advanced_options(self, hostname, options):
         """Save advanced options for a specific host"""
-        if "connections" not in self.config:
-            self.config["connections"] = {}
-        
-        if hostname not in self.config["connections"]:
-            self.config["connections"][hostname] = {}
-        
-        self.config["connections"][hostname]["advanced"] = options
-        self.save_config()
+        self._connections.setdefault(hostname, {})["advanced"] = options
+        self._adv_cache[hostname] = dict(options)
+        self._schedule_save()
     
     def save_connection_info(self, hostname, username, domain):
         """Save connection information"""
-        if "connections" not in self.config:
-            self.config["connections"] = {}
-        
-        if hostname not in self.config["connections"]:
-            self.config["connections"][hostname] = {}
-        
-        self.config["connections"][hostname]["username"] = username
-        self.config["connections"][hostname]["domain"] = domain
-        self.config["connections"][hostname]["last_used"] = GLib.DateTime.new_now_local().format("%Y-%m-%d %H:%M:%S")
-        
-        # Add to recent connections
-        if "recent" not in self.config:
-            self.config["recent"] = []
-        
-        # Remove if already in recent
-        self.config["recent"] = [r for r in self.config["recent"] if r != hostname]
-        
-        # Add to beginning
-        self.config["recent"].insert(0, hostname)
-        
-        # Keep only last 10
-        self.config["recent"] = self.config["recent"][:10]
-        
-        self.save_config()
+        conn = self._connections.setdefault(hostname, {})
+        if conn.get("username") != username or conn.get("domain") != domain:
+            self._recent_markup_prefix.pop(hostname, None)
+        conn["username"] = username
+        conn["domain"] = domain
+        conn["last_used"] = GLib.DateTime.new_now_local().format("%Y-%m-%d %H:%M:%S")
+        
+        # Move to the beginning of recent connections (the deque keeps only the last 10)
+        if hostname in self._recent_set:
+            self._recent.remove(hostname)
+        elif len(self._recent) == RECENT_MAX:
+            # appendleft will push the oldest entry off the end
+            self._recent_set.discard(self._recent[-1])
+        self._recent.appendleft(hostname)
+        self._recent_set.add(hostname)
+        
+        self._schedule_save()
         
         # Refresh the hostname dropdown
         self.populate_hostname_dropdown()
         
-        # Refresh recent connections list
-        self.load_recent_connections()
+        # Move or add this connection's row in the recent list
+        self.update_recent_row(hostname)
     
     def load_recent_connections(self):
         """Load recent connections into the list"""
+        # Drop any batches still pending from a previous load
+        if self._recent_batch_source:
+            GLib.source_remove(self._recent_batch_source)
+            self._recent_batch_source = None
+        
         # Clear existing
-        for child in self.recent_listbox.get_children():
-            self.recent_listbox.remove(child)
+        self._recent_store.clear()
+        self._recent_rows.clear()
         
-        # Add recent connections
-        for hostname in self.config.get("recent", []):
-            if hostname in self.config.get("connections", {}):
-                conn = self.config["connections"][hostname]
-                
-                row = Gtk.ListBoxRow()
-                hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-                hbox.set_border_width(5)
-                row.add(hbox)
-                
-                # Connection info
-                username = conn.get("username", "")
-                domain = conn.get("domain", "")
-                last_used = conn.get("last_used", "")
-                
-                label_text = f"<b>{hostname}</b>\n"
-                if domain:
-                    label_text += f"User: {domain}\\{username}\n"
-                else:
-                    label_text += f"User: {username}\n"
-                label_text += f"<small>Last used: {last_used}</small>"
-                
-                label = Gtk.Label()
-                label.set_markup(label_text)
-                label.set_xalign(0)
-                hbox.pack_start(label, True, True, 0)
-                
-                # Store hostname in row for selection
-                row.hostname = hostname
-                
-                self.recent_listbox.add(row)
+        # Add recent connections in batches so long histories don't stall the UI
+        hostnames = [h for h in self._recent if h in self._connections]
+        self._recent_batch_source = GLib.idle_add(self._populate_recent_batch, hostnames, 0)
+    
+    def _populate_recent_batch(self, hostnames, start):
+        """Add one batch of recent connection rows to the list"""
+        end = start + RECENT_BATCH_SIZE
         
-        self.recent_listbox.show_all()
+        for hostname in hostnames[start:end]:
+            self._recent_rows[hostname] = self._recent_store.append(self._recent_row_values(hostname))
+        
+        if end < len(hostnames):
+            self._recent_batch_source = GLib.idle_add(self._populate_recent_batch, hostnames, end)
+        else:
+            self._recent_batch_source = None
+        return False
     
-    def on_recent_selected(self, listbox, row):
+    def update_recent_row(self, hostname):
+        """Move the row for hostname to the top of the recent list, adding it if needed"""
+        if self._recent_batch_source:
+            # A full load is still in progress; start over so it includes this change
+            self.load_recent_connections()
+            return
+        
+        values = self._recent_row_values(hostname)
+        tree_iter = self._recent_rows.get(hostname)
+        if tree_iter is not None:
+            self._recent_store.move_after(tree_iter, None)  # None moves it to the start
+            self._recent_store.set_row(tree_iter, values)
+        else:
+            self._recent_rows[hostname] = self._recent_store.prepend(values)
+        
+        # Drop rows that fell off the end of the recent list
+        recent = self._recent_set
+        for stale in [h for h in self._recent_rows if h not in recent]:
+            self._recent_store.remove(self._recent_rows.pop(stale))
+    
+    def _recent_row_values(self, hostname):
+        """Build the list store values for a recent connection"""
+        conn = self._connections[hostname]
+        
+        # Connection info
+        username = conn.get("username", "")
+        domain = conn.get("domain", "")
+        last_used = conn.get("last_used", "")
+        
+        # Hostname and user lines rarely change; only the timestamp is reformatted
+        prefix = self._recent_markup_prefix.get(hostname)
+        if prefix is None:
+            # Escape once here; '&' or '<' in a field would otherwise break the markup
+            prefix = f"<b>{_escape(hostname)}</b>\n"
+            if domain:
+                prefix += f"User: {_escape(domain)}\\{_escape(username)}\n"
+            else:
+                prefix += f"User: {_escape(username)}\n"
+            self._recent_markup_prefix[hostname] = prefix
+        label_text = prefix + f"<small>Last used: {last_used}</small>"
+        
+        return [hostname, username, domain, label_text]
+    
+    def on_recent_selected(self, selection):
         """Handle recent connection selection"""
-        if row and hasattr(row, 'hostname'):
-            hostname = row.hostname
-            if hostname in self.config.get("connections", {}):
-                conn = self.config["connections"][hostname]
-                
+        model, tree_iter = selection.get_selected()
+        if tree_iter is not None:
+            hostname = model[tree_iter][RECENT_COL_HOSTNAME]
+            conn = self._connections.get(hostname)
+            if conn is not None:
                 # Fill in the fields
                 self.hostname_entry.set_text(hostname)
                 self.username_entry.set_text(conn.get("username", ""))
                 self.domain_entry.set_text(conn.get("domain", ""))
     
+    def _bg_load_config(self):
+        """Read the configuration file (runs in a worker thread)"""
+        config = self.load_config()
+        GLib.idle_add(self._on_config_loaded, config)
+    
+    def _on_config_loaded(self, config):
+        """Install the loaded configuration and fill the widgets"""
+        if self._config_loaded:
+            return False
+        self._merge_loaded_config(config)
+        
+        # Populate hostname dropdown
+        self.populate_hostname_dropdown()
+        
+        # Load recent connections
+        self.load_recent_connections()
+        return False
+    
+    def _merge_loaded_config(self, config):
+        """Install the loaded configuration, keeping changes made while it was loading"""
+        pending_connections = self._connections
+        pending_recent = list(self._recent)
+        
+        self.config = config
+        self._connections = self.config.setdefault("connections", {})
+        for hostname, conn in pending_connections.items():
+            self._connections.setdefault(hostname, {}).update(conn)
+        
+        recent = pending_recent + [h for h in self.config.get("recent", []) if h not in pending_recent]
+        self._recent = collections.deque(recent[:RECENT_MAX], maxlen=RECENT_MAX)
+        self._recent_set = set(self._recent)
+        self._adv_cache.clear()
+        self._recent_markup_prefix.clear()
+        self._config_loaded = True
+        
+        # Write out anything that was held back while loading
+        if self._config_dirty:
+            self._schedule_save()
+    
     def load_config(self):
         """Load configuration from file"""
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r') as f:
-                    return json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    return _loads(f.read())
             except:
                 pass
         return {}
     
+    def _schedule_save(self):
+        """Mark the config as changed and write it out shortly"""
+        self._config_dirty = True
+        # Coalesce bursts of changes into a single write
+        if not self._save_timeout:
+            self._save_timeout = GLib.timeout_add(500, self._flush_config)
+    
+    def _flush_config(self):
+        """Write the config to disk if it has unsaved changes"""
+        self._save_timeout = None
+        if not self._config_loaded:
+            return False  # Stay dirty; saved once the file has been merged in
+        if self._config_dirty:
+            self._config_dirty = False
+            self.config["recent"] = list(self._recent)
+            try:
+                self.save_config()
+            except Exception:
+                self._config_dirty = True  # Retried with the next save or on exit
+                raise
+        return False
+    
     def save_config(self):
         """Save configuration to file"""
-        os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2)
-        # Set restrictive permissions
-        os.chmod(self.config_file, 0o600)
+        data = _dumps(self.config, indent=True)
+        if data == self._last_serialized:
+            return  # Nothing changed since the last write
+        
+        # Write to a temp file and rename it over the config so an
+        # interrupted write never leaves a truncated file behind.
+        # The temp file is created with 0600 permissions.
+        f = tempfile.NamedTemporaryFile(dir=os.path.dirname(self.config_file), delete=False)
+        try:
+            with f:
+                f.write(data)
+            os.replace(f.name, self.config_file)
+        except BaseException:
+            # Don't leave the temp file behind if the write or rename fails (e.g. disk full)
+            os.remove(f.name)
+            raise
+        self._last_serialized = data
+    
+    def _probe_keyring(self):
+        """Probe keyring support and sync the menu toggle with the result"""
+        if not _ensure_keyring():
+            self.use_keyring = False
+            with self.keyring_toggle_item.handler_block(self._keyring_toggle_handler):
+                self.keyring_toggle_item.set_active(False)
+        return False
+    
+    def get_credentials(self):
+        """Get stored credentials, loading them on first use"""
+        if self.stored_credentials is None:
+            # Stored as "hostname:username" keys; hostnames may carry a :port
+            self.stored_credentials = collections.OrderedDict(
+                (tuple(key.rsplit(":", 1)), password)
+                for key, password in self.load_credentials().items()
+                if ":" in key
+            )
+        return self.stored_credentials
+    
+    def _serialize_credentials(self):
+        """Convert stored credentials back to their "hostname:username" storage format"""
+        return {f"{hostname}:{username}": password
+                for (hostname, username), password in self.stored_credentials.items()}
     
     def load_credentials(self):
         """Load stored credentials"""
         credentials = {}
         
         # Try keyring first if available and enabled
-        if KEYRING_AVAILABLE and self.use_keyring:
+        if self.use_keyring and _ensure_keyring():
             try:
                 stored = keyring.get_password("rdp2gui", "credentials")
                 if stored:
-                    return json.loads(stored)
+                    return _loads(stored)
             except Exception as e:
                 # Silently fall back to file storage
                 pass
@@ -1097,10 +1467,8 @@ class RDPManager(Gtk.Window):
         # Fallback to file storage
         if os.path.exists(self.credentials_file):
             try:
-                with open(self.credentials_file, 'r') as f:
-                    credentials = json.load(f)
-                # Set restrictive permissions
-                os.chmod(self.credentials_file, 0o600)
+                with open(self.credentials_file, 'rb') as f:
+                    credentials = _loads(f.read())
             except:
                 pass
         
@@ -1108,30 +1476,50 @@ class RDPManager(Gtk.Window):
     
     def save_password(self, hostname, username, password):
         """Save password securely"""
-        key = f"{hostname}:{username}"
-        self.stored_credentials[key] = password
+        credentials = self.get_credentials()
+        key = (hostname, username)
+        credentials[key] = password
+        credentials.move_to_end(key)
+        
+        # Keep the store (and the keyring blob) from growing without bound
+        while len(credentials) > CREDENTIALS_MAX:
+            credentials.popitem(last=False)
+        
+        # Write the whole credential store once things settle down
+        self._creds_dirty = True
+        if not self._creds_timeout:
+            self._creds_timeout = GLib.timeout_add(1000, self._flush_credentials)
+    
+    def _flush_credentials(self):
+        """Write stored credentials if they have unsaved changes"""
+        self._creds_timeout = None
+        if not self._creds_dirty:
+            return False
+        self._creds_dirty = False
         
         # Try keyring first if available and enabled
-        if KEYRING_AVAILABLE and self.use_keyring:
+        if self.use_keyring and _ensure_keyring():
             try:
                 keyring.set_password("rdp2gui", "credentials", 
-                                   json.dumps(self.stored_credentials))
-                return
+                                   _dumps(self._serialize_credentials()).decode())
+                return False
             except:
                 # Fall back to file storage
                 pass
         
-        # Fallback to file storage
-        os.makedirs(os.path.dirname(self.credentials_file), exist_ok=True)
-        with open(self.credentials_file, 'w') as f:
-            json.dump(self.stored_credentials, f)
-        # Set restrictive permissions
-        os.chmod(self.credentials_file, 0o600)
+        # Fallback to file storage (restrictive permissions applied at creation)
+        try:
+            fd = os.open(self.credentials_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_dumps(self._serialize_credentials()))
+        except Exception:
+            self._creds_dirty = True  # Retried with the next save or on exit
+            raise
+        return False
     
     def get_password_for_connection(self, hostname, username):
         """Get stored password for a connection"""
-        key = f"{hostname}:{username}"
-        return self.stored_credentials.get(key)
+        return self.get_credentials().get((hostname, username))
     
     def clear_saved_passwords(self, widget):
         """Clear all saved passwords"""
@@ -1147,14 +1535,25 @@ class RDPManager(Gtk.Window):
             "Continue?"
         )
         
-        response = dialog.run()
+        dialog.set_modal(True)
+        dialog.connect("response", self._on_clear_passwords_response)
+        dialog.show()
+    
+    def _on_clear_passwords_response(self, dialog, response):
+        """Clear saved passwords if the user confirmed"""
         dialog.destroy()
         
         if response == Gtk.ResponseType.YES:
-            self.stored_credentials = {}
+            self.stored_credentials = collections.OrderedDict()
+            
+            # Drop any pending write of the old credentials
+            if self._creds_timeout:
+                GLib.source_remove(self._creds_timeout)
+                self._creds_timeout = None
+            self._creds_dirty = False
             
             # Clear from keyring
-            if KEYRING_AVAILABLE and self.use_keyring:
+            if self.use_keyring and _ensure_keyring():
                 try:
                     keyring.delete_password("rdp2gui", "credentials")
                 except:
@@ -1172,7 +1571,7 @@ class RDPManager(Gtk.Window):
         
         if not self.use_keyring:
             self.show_info("System keyring disabled. Passwords will be stored locally.")
-        elif not KEYRING_AVAILABLE:
+        elif not _ensure_keyring():
             widget.set_active(False)
             self.use_keyring = False
             self.show_info("Keyring module not available. Please install it first:\nTools → Install Keyring Support")
@@ -1200,7 +1599,12 @@ class RDPManager(Gtk.Window):
             "FreeRDP is not installed on your system. Would you like to install it?"
         )
         
-        response = dialog.run()
+        dialog.set_modal(True)
+        dialog.connect("response", self._on_install_prompt_response)
+        dialog.show()
+    
+    def _on_install_prompt_response(self, dialog, response):
+        """Handle the answer to the install prompt"""
         dialog.destroy()
         
         if response == Gtk.ResponseType.YES:
@@ -1256,54 +1660,33 @@ sudo apt install -y freerdp2-x11
         buffer = text_view.get_buffer()
         buffer.set_text(commands)
         
+        dialog.set_modal(True)
+        dialog.connect("response", self._on_install_response)
         dialog.show_all()
-        response = dialog.run()
+    
+    def _on_install_response(self, dialog, response):
+        """Handle the buttons of the FreeRDP installation dialog"""
+        dialog.destroy()
         
         if response == Gtk.ResponseType.OK:
-            dialog.destroy()
             self.run_installation()
         elif response == Gtk.ResponseType.APPLY:
             # Copy to clipboard
             clipboard = Gtk.Clipboard.get(Gdk.SELECTION_CLIPBOARD)
             clipboard.set_text("sudo apt update && sudo apt install -y freerdp2-x11", -1)
-            dialog.destroy()
             self.show_info("Commands copied to clipboard!")
-        else:
-            dialog.destroy()
     
     def run_installation(self):
         """Run FreeRDP installation"""
-        commands = """#!/bin/bash
-echo "Installing FreeRDP..."
-echo ""
-sudo apt update
-sudo apt install -y freerdp2-x11
-if [ $? -eq 0 ]; then
-    echo ""
-    echo "✓ FreeRDP installed successfully!"
-    echo ""
-    echo "Please restart the RDP GUI to use it."
-else
-    echo ""
-    echo "✗ Installation failed."
-    echo "Please check your internet connection and try again."
-fi
-echo ""
-echo "Press Enter to close..."
-read
-"""
-        
-        # Save commands to temp script
-        script_path = "/tmp/install_freerdp.sh"
-        with open(script_path, 'w') as f:
-            f.write(commands)
-        os.chmod(script_path, 0o755)
+        # Save commands to a script in our own config directory, not a shared /tmp path
+        script_path = os.path.join(os.path.dirname(self.config_file), "install_freerdp.sh")
+        _write_install_script(script_path, _INSTALL_FREERDP_SH)
         
         # Get terminal command
         terminal_cmd = self.get_terminal_command(script_path)
         
         if terminal_cmd:
-            subprocess.Popen(terminal_cmd, shell=True)
+            subprocess.Popen(terminal_cmd)
             
             dialog = Gtk.MessageDialog(
                 transient_for=self,
@@ -1317,27 +1700,35 @@ read
                 "Please enter your sudo password when prompted.\n"
                 "After installation completes, restart this application."
             )
-            dialog.run()
-            dialog.destroy()
+            dialog.set_modal(True)
+            dialog.connect("response", RDPManager._destroy_on_response)
+            dialog.show()
         else:
             self.show_error("Could not determine terminal emulator. Please install manually.")
     
     def get_terminal_command(self, script_path):
         """Get the appropriate terminal command for the system"""
-        # Try different terminal emulators
-        terminals = [
-            ("gnome-terminal", f"gnome-terminal -- bash {script_path}"),
-            ("xfce4-terminal", f"xfce4-terminal -e 'bash {script_path}'"),
-            ("mate-terminal", f"mate-terminal -e 'bash {script_path}'"),
-            ("konsole", f"konsole -e bash {script_path}"),
-            ("xterm", f"xterm -e bash {script_path}"),
-        ]
-        
-        for term_name, term_cmd in terminals:
-            if shutil.which(term_name):
-                return term_cmd
+        if self._terminal_cmd is None:
+            # Try different terminal emulators; xfce4/mate take -e as one command
+            # string, so the path is shell-quoted there
+            terminals = [
+                ("gnome-terminal", ["gnome-terminal", "--", "bash", "{script_path}"]),
+                ("xfce4-terminal", ["xfce4-terminal", "-e", "bash {quoted_path}"]),
+                ("mate-terminal", ["mate-terminal", "-e", "bash {quoted_path}"]),
+                ("konsole", ["konsole", "-e", "bash", "{script_path}"]),
+                ("xterm", ["xterm", "-e", "bash", "{script_path}"]),
+            ]
+            
+            for term_name, term_cmd in terminals:
+                if shutil.which(term_name):
+                    self._terminal_cmd = term_cmd
+                    break
+            else:
+                return None
         
-        return None
+        quoted_path = shlex.quote(script_path)
+        return [arg.format(script_path=script_path, quoted_path=quoted_path)
+                for arg in self._terminal_cmd]
     
     def show_keyring_install_dialog(self, widget=None):
         """Show keyring installation dialog"""
@@ -1389,54 +1780,33 @@ sudo apt install -y python3-keyring python3-secretstorage gnome-keyring
         buffer = text_view.get_buffer()
         buffer.set_text(commands)
         
+        dialog.set_modal(True)
+        dialog.connect("response", self._on_keyring_install_response)
         dialog.show_all()
-        response = dialog.run()
+    
+    def _on_keyring_install_response(self, dialog, response):
+        """Handle the buttons of the keyring installation dialog"""
+        dialog.destroy()
         
         if response == Gtk.ResponseType.OK:
-            dialog.destroy()
             self.run_keyring_installation()
         elif response == Gtk.ResponseType.APPLY:
             # Copy to clipboard
             clipboard = Gtk.Clipboard.get(Gdk.SELECTION_CLIPBOARD)
             clipboard.set_text("sudo apt install -y python3-keyring python3-secretstorage gnome-keyring", -1)
-            dialog.destroy()
             self.show_info("Commands copied to clipboard!")
-        else:
-            dialog.destroy()
     
     def run_keyring_installation(self):
         """Run keyring installation"""
-        commands = """#!/bin/bash
-echo "Installing Python keyring module..."
-echo ""
-sudo apt update
-sudo apt install -y python3-keyring python3-secretstorage gnome-keyring
-if [ $? -eq 0 ]; then
-    echo ""
-    echo "✓ Keyring support installed successfully!"
-    echo ""
-    echo "Please restart the RDP GUI to use secure password storage."
-else
-    echo ""
-    echo "✗ Installation failed."
-    echo "Please check your internet connection and try again."
-fi
-echo ""
-echo "Press Enter to close..."
-read
-"""
-        
-        # Save commands to temp script
-        script_path = "/tmp/install_keyring.sh"
-        with open(script_path, 'w') as f:
-            f.write(commands)
-        os.chmod(script_path, 0o755)
+        # Save commands to a script in our own config directory, not a shared /tmp path
+        script_path = os.path.join(os.path.dirname(self.config_file), "install_keyring.sh")
+        _write_install_script(script_path, _INSTALL_KEYRING_SH)
         
         # Get terminal command
         terminal_cmd = self.get_terminal_command(script_path)
         
         if terminal_cmd:
-            subprocess.Popen(terminal_cmd, shell=True)
+            subprocess.Popen(terminal_cmd)
             
             dialog = Gtk.MessageDialog(
                 transient_for=self,
@@ -1449,8 +1819,9 @@ read
                 "The keyring installation has been started in a new terminal.\n"
                 "After installation completes, restart this application."
             )
-            dialog.run()
-            dialog.destroy()
+            dialog.set_modal(True)
+            dialog.connect("response", RDPManager._destroy_on_response)
+            dialog.show()
         else:
             self.show_error("Could not determine terminal emulator. Please install manually.")
     
@@ -1463,8 +1834,9 @@ read
             buttons=Gtk.ButtonsType.OK,
             text=message
         )
-        dialog.run()
-        dialog.destroy()
+        dialog.set_modal(True)
+        dialog.connect("response", RDPManager._destroy_on_response)
+        dialog.show()
     
     def show_info(self, message):
         """Show info dialog"""
@@ -1475,8 +1847,9 @@ read
             buttons=Gtk.ButtonsType.OK,
             text=message
         )
-        dialog.run()
-        dialog.destroy()
+        dialog.set_modal(True)
+        dialog.connect("response", RDPManager._destroy_on_response)
+        dialog.show()
 
 if __name__ == "__main__":
     win = RDPManager()